@@ -3,13 +3,15 @@
 全サイト共通の処理を定義し、各サイト固有の実装は継承クラスで行う
 """
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Set
+from typing import List, Dict, Any, Set, Tuple
 from pathlib import Path
 import sys
-import json
-import time
+import asyncio
+import aiohttp
+import orjson
 from utils.logger import get_logger
-from utils.notify import send_line_notification
+from utils.notify import send_line_notifications
+from utils.history import SeenHistory
 
 logger = get_logger(__name__)
 
@@ -30,6 +32,8 @@ class BaseScraper(ABC):
         self.keywords = config.get('keywords', [])
         self.min_price = config.get('min_price', 0)
         self.enabled = config.get('enabled', True)
+        # 同一サイトへの同時リクエスト数（非同期実行時）
+        self.concurrency = config.get('concurrency', 2)
 
         # 実行ファイルの場所を取得するロジック
         if getattr(sys, "frozen", False):
@@ -37,11 +41,19 @@ class BaseScraper(ABC):
         else:
             app_path = Path(__file__).parent
 
-        # 既に通知済みの商品IDを保持する履歴ファイル（サイトごと）
-        # 履歴ファイルを app_path (exeと同じ場所) に保存する
-        self._history_file = app_path / f"{self.site_name}_seen_items.json"
-        # キーワードごとに通知済み商品IDを管理
-        self._seen_items_by_keyword: Dict[str, Set[str]] = self._load_seen_items()
+        # 既に通知済みの商品IDを保持する履歴DB（全サイト共通、site列で区別）
+        # 履歴DBを app_path (exeと同じ場所) に保存する
+        self._history = SeenHistory(app_path / "seen_items.db")
+        # 旧形式の履歴ファイルがあれば初回のみ取り込む
+        self._legacy_history_file = app_path / f"{self.site_name}_seen_items.json"
+        self._import_legacy_history()
+        
+    def close(self) -> None:
+        """
+        スクレイパーが保持するリソース（履歴DBの接続）を解放する
+        設定の再読み込みでスクレイパーを作り直す前に呼び出す
+        """
+        self._history.close()
         
     def run(self) -> None:
         """
@@ -63,41 +75,7 @@ class BaseScraper(ABC):
             for keyword in self.keywords:
                 try:
                     items = self.search(keyword)
-                    seen_items = self._get_seen_items_for_keyword(keyword)
-
-                    # 初回実行（＝このキーワードの履歴がまだない／空）の場合は
-                    # 取得した商品を「初期データ」として保存するだけで通知しない
-                    if not seen_items:
-                        saved_count = 0
-                        for item in items:
-                            item_id = self.get_item_id(item)
-                            if item_id:
-                                seen_items.add(item_id)
-                                saved_count += 1
-                        self._save_seen_items()
-                        logger.info(
-                            f"{self.site_name}: 初回起動のため、通知をスキップして"
-                            f"{saved_count}件の商品をデータベースに登録しました（キーワード: {keyword}）"
-                        )
-                    else:
-                        # 2回目以降：前回までの履歴にない商品だけを「新着」として通知
-                        new_items = self.filter_new_items(items, seen_items)
-                        
-                        if new_items:
-                            logger.info(f"{self.site_name}: {len(new_items)}件の新着商品を発見（キーワード: {keyword}）")
-                            for item in new_items:
-                                self.notify(item)
-                                # 通知済みとして記録
-                                item_id = self.get_item_id(item)
-                                if item_id:
-                                    seen_items.add(item_id)
-                            # キーワードごとの履歴を永続化
-                            self._save_seen_items()
-                        else:
-                            logger.debug(f"{self.site_name}: 新着商品なし（キーワード: {keyword}）")
-                        
-                    # リクエスト間隔を空ける（サーバー負荷軽減）
-                    time.sleep(2)
+                    self._process_items(keyword, items)
                     
                 except Exception as e:
                     logger.error(f"{self.site_name}: キーワード '{keyword}' の検索中にエラー: {e}", exc_info=True)
@@ -106,44 +84,120 @@ class BaseScraper(ABC):
         except Exception as e:
             logger.error(f"{self.site_name}: 実行中にエラーが発生: {e}", exc_info=True)
 
-    # =========================
-    # 履歴管理（初回判定用）
-    # =========================
-    def _load_seen_items(self) -> Dict[str, Set[str]]:
+    async def run_async(self, session: aiohttp.ClientSession) -> None:
         """
-        キーワードごとの通知済み商品IDをファイルから読み込む
+        メイン実行メソッド（非同期版）
+        全キーワードの検索を並行して行い、結果はキーワード順に処理する
+        同一サイトへの同時リクエスト数はセマフォで制限する
+        
+        Args:
+            session: 全スクレイパーで共有するaiohttpセッション
         """
-        if not self._history_file.exists():
-            return {}
-
+        if not self.enabled:
+            logger.info(f"{self.site_name}: スキップ（無効化されています）")
+            return
+            
+        if not self.keywords:
+            logger.warning(f"{self.site_name}: キーワードが設定されていません")
+            return
+            
         try:
-            with open(self._history_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            # JSONから読み込んだリストをセットに変換
-            return {k: set(v) for k, v in data.items()}
+            logger.info(f"{self.site_name}: 監視開始（キーワード: {self.keywords}）")
+            
+            # セマフォはイベントループに紐づくため、実行ごとに作成する
+            semaphore = asyncio.Semaphore(self.concurrency)
+            results = await asyncio.gather(
+                *[self._search_with_limit(session, semaphore, keyword) for keyword in self.keywords],
+                return_exceptions=True
+            )
+            
+            # 履歴の更新・通知はキーワード順に1件ずつ行う（ブロッキング処理はスレッドに逃がす）
+            for keyword, result in zip(self.keywords, results):
+                if isinstance(result, BaseException):
+                    logger.error(
+                        f"{self.site_name}: キーワード '{keyword}' の検索中にエラー: {result}",
+                        exc_info=(type(result), result, result.__traceback__)
+                    )
+                    continue
+                try:
+                    await asyncio.to_thread(self._process_items, keyword, result)
+                except Exception as e:
+                    logger.error(f"{self.site_name}: キーワード '{keyword}' の処理中にエラー: {e}", exc_info=True)
+                    
         except Exception as e:
-            logger.error(f"{self.site_name}: 履歴データ読み込みエラー: {e}", exc_info=True)
-            return {}
+            logger.error(f"{self.site_name}: 実行中にエラーが発生: {e}", exc_info=True)
 
-    def _save_seen_items(self) -> None:
+    async def _search_with_limit(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, keyword: str) -> List[Dict[str, Any]]:
         """
-        キーワードごとの通知済み商品IDをファイルに保存する
+        セマフォで同時実行数を制限しながら検索する
+        
+        Args:
+            session: aiohttpセッション
+            semaphore: サイト単位のセマフォ
+            keyword: 検索キーワード
+            
+        Returns:
+            商品情報のリスト
         """
-        try:
-            serializable = {k: list(v) for k, v in self._seen_items_by_keyword.items()}
-            with open(self._history_file, "w", encoding="utf-8") as f:
-                json.dump(serializable, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.error(f"{self.site_name}: 履歴データ保存エラー: {e}", exc_info=True)
+        # リクエスト間隔は各サイトのsearch/search_asyncでホスト単位に制御する
+        async with semaphore:
+            return await self.search_async(session, keyword)
 
-    def _get_seen_items_for_keyword(self, keyword: str) -> Set[str]:
+    def _process_items(self, keyword: str, items: List[Dict[str, Any]]) -> None:
         """
-        指定キーワードの通知済み商品IDセットを取得（なければ空セットを作成）
+        検索結果を履歴と照合し、新着商品を通知する
+        
+        Args:
+            keyword: 検索キーワード
+            items: 商品情報のリスト
         """
-        if keyword not in self._seen_items_by_keyword:
-            self._seen_items_by_keyword[keyword] = set()
-        return self._seen_items_by_keyword[keyword]
-    
+        # 商品IDは1商品につき1回だけ取得し、以降は (商品ID, 商品情報) の組で扱う
+        pairs = [(self.get_item_id(item), item) for item in items]
+        item_ids = [item_id for item_id, _ in pairs if item_id]
+
+        # 初回実行（＝このキーワードの履歴がまだない）の場合は
+        # 取得した商品を「初期データ」として保存するだけで通知しない
+        if not self._history.has_keyword(self.site_name, keyword):
+            self._history.mark_seen_many(self.site_name, keyword, item_ids)
+            logger.info(
+                f"{self.site_name}: 初回起動のため、通知をスキップして"
+                f"{len(item_ids)}件の商品をデータベースに登録しました（キーワード: {keyword}）"
+            )
+        else:
+            # 2回目以降：前回までの履歴にない商品だけを「新着」として通知
+            seen_items = self._history.seen_ids(self.site_name, keyword, item_ids)
+            new_items = self.filter_new_items(pairs, seen_items)
+            
+            if new_items:
+                logger.info("%s: %d件の新着商品を発見（キーワード: %s）", self.site_name, len(new_items), keyword)
+                # 新着商品はまとめて1回で通知する
+                self.notify_many([item for _, item in new_items])
+                # 通知済みとして記録し、キーワードごとの履歴を永続化
+                self._history.mark_seen_many(self.site_name, keyword, [item_id for item_id, _ in new_items])
+            else:
+                logger.debug("%s: 新着商品なし（キーワード: %s）", self.site_name, keyword)
+
+    # =========================
+    # 履歴管理（初回判定用）
+    # =========================
+    def _import_legacy_history(self) -> None:
+        """
+        旧形式の履歴ファイル（{キーワード: [商品ID, ...]} 形式のJSON）を履歴DBに取り込む
+        履歴DBにこのサイトの履歴が既にある場合は何もしない
+        """
+        if not self._legacy_history_file.exists() or self._history.has_site(self.site_name):
+            return
+
+        try:
+            data = orjson.loads(self._legacy_history_file.read_bytes())
+            # 途中で失敗しても一部だけ取り込まれた状態にならないよう、1トランザクションで取り込む
+            with self._history.transaction():
+                for keyword, ids in data.items():
+                    self._history.mark_seen_many(self.site_name, keyword, ids)
+            logger.info(f"{self.site_name}: 旧履歴ファイルを取り込みました: {self._legacy_history_file.name}")
+        except Exception as e:
+            logger.error(f"{self.site_name}: 旧履歴データ読み込みエラー: {e}", exc_info=True)
+
     @abstractmethod
     def search(self, keyword: str) -> List[Dict[str, Any]]:
         """
@@ -156,6 +210,20 @@ class BaseScraper(ABC):
             商品情報のリスト（各要素は辞書形式）
         """
         pass
+
+    async def search_async(self, session: aiohttp.ClientSession, keyword: str) -> List[Dict[str, Any]]:
+        """
+        指定キーワードで商品を検索する（非同期版）
+        デフォルトでは同期版のsearch()をスレッドで実行する。aiohttpに対応するサイトはオーバーライドする
+        
+        Args:
+            session: aiohttpセッション
+            keyword: 検索キーワード
+            
+        Returns:
+            商品情報のリスト（各要素は辞書形式）
+        """
+        return await asyncio.to_thread(self.search, keyword)
     
     @abstractmethod
     def parse(self, html: str) -> List[Dict[str, Any]]:
@@ -183,25 +251,27 @@ class BaseScraper(ABC):
         """
         pass
     
-    def filter_new_items(self, items: List[Dict[str, Any]], seen_items: Set[str]) -> List[Dict[str, Any]]:
+    def filter_new_items(self, items: List[Tuple[str, Dict[str, Any]]], seen_items: Set[str]) -> List[Tuple[str, Dict[str, Any]]]:
         """
         新着商品のみをフィルタリング
         
         Args:
-            items: 商品情報のリスト
-            seen_items: 既に通知済みの商品IDセット（キーワード単位）
+            items: (商品ID, 商品情報) のリスト（商品IDは取得済みのものを使う）
+            seen_items: 既に通知済みの商品IDセット（キーワード単位、履歴DBの照会結果）
             
         Returns:
-            新着商品のリスト
+            新着商品の (商品ID, 商品情報) のリスト
         """
         new_items = []
-        for item in items:
-            item_id = self.get_item_id(item)
-            if item_id and item_id not in seen_items:
-                # 最低価格チェック
-                price = self.get_price(item)
-                if price and price >= self.min_price:
-                    new_items.append(item)
+        for item_id, item in items:
+            # 通知済みかどうかを先に判定（定常時は大半が通知済み）
+            if not item_id or item_id in seen_items:
+                continue
+            # 最低価格チェック（未通知の商品のみ）
+            price = self.get_price(item)
+            if not price or price < self.min_price:
+                continue
+            new_items.append((item_id, item))
         return new_items
     
     def get_price(self, item: Dict[str, Any]) -> int:
@@ -223,10 +293,19 @@ class BaseScraper(ABC):
         Args:
             item: 商品情報辞書
         """
+        self.notify_many([item])
+    
+    def notify_many(self, items: List[Dict[str, Any]]) -> None:
+        """
+        複数商品のLINE通知をまとめて送信
+        
+        Args:
+            items: 商品情報辞書のリスト
+        """
         try:
-            message = self.format_notification_message(item)
-            send_line_notification(message)
-            logger.info(f"{self.site_name}: 通知送信成功 - {item.get('title', 'N/A')}")
+            messages = [self.format_notification_message(item) for item in items]
+            if send_line_notifications(messages):
+                logger.info("%s: 通知送信成功 - %d件", self.site_name, len(items))
         except Exception as e:
             logger.error(f"{self.site_name}: 通知送信失敗: {e}", exc_info=True)
     
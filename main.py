@@ -1,7 +1,10 @@
 """
 リセール商品監視ツール - メイン処理
 """
-import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import orjson
+import aiohttp
 import schedule
 import time
 import sys
@@ -27,6 +30,14 @@ logger = get_logger(__name__)
 CONFIG_FILE = get_app_path() / "config.json"
 ENV_FILE = get_app_path() / ".env"
 
+# ブロッキング処理（履歴DB・LINE通知・同期版の検索）に使うスレッド数の上限
+MAX_WORKERS = 8
+
+# 設定ファイルの更新時刻と、その時点の設定から作成したスクレイパー
+# （設定ファイルが更新されたときだけ読み直す）
+_cached_mtime_ns = None
+_cached_scrapers: list = []
+
 
 def load_config() -> Dict[str, Any]:
     """
@@ -40,13 +51,13 @@ def load_config() -> Dict[str, Any]:
             logger.error(f"設定ファイルが見つかりません: {CONFIG_FILE}")
             return {}
         
-        with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-            config = json.load(f)
+        # ファイル全体を一度に読み込んでから解析する
+        config = orjson.loads(CONFIG_FILE.read_bytes())
         
         logger.info("設定ファイルを読み込みました")
         return config
         
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"設定ファイルのJSON解析エラー: {e}")
         return {}
     except Exception as e:
@@ -86,33 +97,77 @@ def create_scrapers(config: Dict[str, Any]) -> list:
     return scrapers
 
 
+async def run_scrapers_async(scrapers: list) -> None:
+    """
+    全スクレイパーを1つのイベントループ上で並行実行する
+    
+    Args:
+        scrapers: スクレイパーインスタンスのリスト
+    """
+    # 同一ホストへの同時接続数を制限しつつ、接続は全スクレイパーで使い回す
+    connector = aiohttp.TCPConnector(limit_per_host=4)
+    # ブロッキング処理は固定スレッドプール（上限あり）で実行する
+    # 同期版の検索が各サイトのconcurrencyまで並行できるよう、その合計＋1（履歴・通知・DNS解決用）とする
+    max_workers = min(MAX_WORKERS, sum(scraper.concurrency for scraper in scrapers) + 1)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    asyncio.get_running_loop().set_default_executor(executor)
+    
+    async with aiohttp.ClientSession(connector=connector) as session:
+        results = await asyncio.gather(
+            *(scraper.run_async(session) for scraper in scrapers),
+            return_exceptions=True
+        )
+    
+    for scraper, result in zip(scrapers, results):
+        if isinstance(result, BaseException):
+            logger.error(
+                f"スクレイパー実行エラー ({scraper.site_name}): {result}",
+                exc_info=(type(result), result, result.__traceback__)
+            )
+
+
 def run_monitoring():
     """
     監視処理を実行
     """
+    global _cached_mtime_ns, _cached_scrapers
+    
     logger.info("=" * 50)
     logger.info("監視処理を開始します")
     logger.info("=" * 50)
     
-    # 設定読み込み
-    config = load_config()
-    if not config:
-        logger.error("設定ファイルが読み込めませんでした。処理を終了します。")
-        return
+    try:
+        mtime_ns = CONFIG_FILE.stat().st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    
+    if mtime_ns is not None and mtime_ns == _cached_mtime_ns:
+        # 設定ファイルに変更がなければ前回のスクレイパーを使い回す
+        scrapers = _cached_scrapers
+    else:
+        # 設定読み込み
+        config = load_config()
+        if config:
+            # スクレイパー作成（古いスクレイパーのリソースは解放する）
+            scrapers = create_scrapers(config)
+            for old_scraper in _cached_scrapers:
+                old_scraper.close()
+            _cached_mtime_ns = mtime_ns
+            _cached_scrapers = scrapers
+        elif _cached_scrapers:
+            # 編集途中などで読み込めない場合は、前回の設定のまま監視を続ける
+            logger.warning("設定ファイルが読み込めなかったため、前回の設定で監視を続けます。")
+            scrapers = _cached_scrapers
+        else:
+            logger.error("設定ファイルが読み込めませんでした。処理を終了します。")
+            return
     
-    # スクレイパー作成
-    scrapers = create_scrapers(config)
     if not scrapers:
         logger.warning("有効なスクレイパーがありません。処理を終了します。")
         return
     
-    # 各スクレイパーを実行（エラーが発生しても他のスクレイパーは継続）
-    for scraper in scrapers:
-        try:
-            scraper.run()
-        except Exception as e:
-            logger.error(f"スクレイパー実行エラー ({scraper.site_name}): {e}", exc_info=True)
-            continue
+    # 各スクレイパーを並行実行（エラーが発生しても他のスクレイパーは継続）
+    asyncio.run(run_scrapers_async(scrapers))
     
     logger.info("監視処理を完了しました")
     logger.info("=" * 50)
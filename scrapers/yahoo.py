@@ -2,21 +2,68 @@
 Yahoo!オークション用スクレイパー
 """
 import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict, Any
+from requests.adapters import HTTPAdapter
+import aiohttp
+import lxml.html
+from lxml import etree
+from typing import List, Dict, Any, Optional
 import re
-from urllib.parse import quote
+import asyncio
+import time
+import logging
+from urllib.parse import quote, urlparse
 from base_scraper import BaseScraper
 from utils.logger import get_logger
+from utils import rate_limit
 
 logger = get_logger(__name__)
 
+# 商品ごとに呼ばれる正規表現は事前にコンパイルしておく
+_PRICE_NON_DIGITS = re.compile(r'[^\d]')
+_ITEM_ID_RE = re.compile(r'/auction/([a-z0-9]+)')
+_PRICE_TEXT_RE = re.compile(r'¥|円')
+_ALT_HREF_RE = re.compile(r'/jp/auction/')
+_ALT_PRICE_RE = re.compile(r'¥\d+')
+
+# 一時的なエラーとしてリトライするHTTPステータスと回数・バックオフ係数（同期版・非同期版で共通）
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+
+
+def _has_class(class_name: str) -> str:
+    """class属性に指定クラスを含む要素を選択するXPath条件を返す"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+
+# 商品ごとに評価するXPathも事前にコンパイルしておく（呼び出しごとの式の解析を省く）
+_LI_PRODUCT_XPATH = etree.XPath(f"//li[{_has_class('Product')}]")
+_DIV_PRODUCT_XPATH = etree.XPath(f"//div[{_has_class('Product')}]")
+_TITLE_LINK_XPATH = etree.XPath(f".//a[{_has_class('Product__titleLink')}]")
+_H3_XPATH = etree.XPath(".//h3")
+_PRICE_VALUE_XPATH = etree.XPath(f".//span[{_has_class('Product__priceValue')}]")
+_LEAF_SPAN_XPATH = etree.XPath(".//span[not(*)]")
+
+
+def _get_text(element: lxml.html.HtmlElement) -> str:
+    """要素内のテキストを各ノードごとにstripして連結する"""
+    return ''.join(text.strip() for text in element.itertext())
+
 
 class YahooScraper(BaseScraper):
     """Yahoo!オークションのスクレイパー実装"""
     
     BASE_URL = "https://auctions.yahoo.co.jp"
     SEARCH_URL = "https://auctions.yahoo.co.jp/search/search"
+    HOST = urlparse(SEARCH_URL).hostname
+    HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        # brはbrotliパッケージがないと展開できないため指定しない
+        'Accept-Encoding': 'gzip, deflate'
+    }
+    
+    # プロセス内の全インスタンスで共有するrequestsセッション（設定の再読み込み後も使い回す）
+    _shared_session: Optional[requests.Session] = None
     
     def __init__(self, config: Dict[str, Any]):
         """
@@ -26,10 +73,27 @@ class YahooScraper(BaseScraper):
             config: 設定辞書
         """
         super().__init__('yahoo', config)
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        })
+        self.session = self._get_shared_session()
+    
+    @classmethod
+    def _get_shared_session(cls) -> requests.Session:
+        """
+        共有のrequestsセッションを取得（初回のみ作成）
+        同期版のsearch()でのみ使用する（通常の監視ではsearch_async()を使う）
+        
+        Returns:
+            requestsセッション
+        """
+        if cls._shared_session is None:
+            session = requests.Session()
+            session.headers.update(cls.HEADERS)
+            # コネクションを使い回す（keep-alive）
+            # リトライはリクエスト頻度制限を通すため、アダプタではなく_fetch()で行う
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            cls._shared_session = session
+        return cls._shared_session
     
     def search(self, keyword: str) -> List[Dict[str, Any]]:
         """
@@ -42,22 +106,16 @@ class YahooScraper(BaseScraper):
             商品情報のリスト
         """
         try:
-            # 検索URLを生成
-            params = {
-                'va': keyword,  # 検索キーワード
-                'exflg': 1,     # 詳細検索フラグ
-                'b': 1,         # 開始位置
-                'n': 50         # 取得件数
-            }
+            params = self._build_search_params(keyword)
             
-            logger.debug(f"Yahoo検索URL: {self.SEARCH_URL}?va={quote(keyword)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Yahoo検索URL: %s?va=%s", self.SEARCH_URL, quote(keyword))
             
-            response = self.session.get(self.SEARCH_URL, params=params, timeout=10)
-            response.raise_for_status()
+            html = self._fetch(params)
             
             # HTML解析
-            items = self.parse(response.text)
-            logger.info(f"Yahoo検索結果: {len(items)}件（キーワード: {keyword}）")
+            items = self.parse(html)
+            logger.info("Yahoo検索結果: %d件（キーワード: %s）", len(items), keyword)
             
             return items
             
@@ -68,6 +126,117 @@ class YahooScraper(BaseScraper):
             logger.error(f"Yahoo検索処理エラー: {e}", exc_info=True)
             return []
     
+    async def search_async(self, session: aiohttp.ClientSession, keyword: str) -> List[Dict[str, Any]]:
+        """
+        キーワードでYahoo!オークションを検索（非同期版）
+        
+        Args:
+            session: aiohttpセッション
+            keyword: 検索キーワード
+            
+        Returns:
+            商品情報のリスト
+        """
+        try:
+            params = self._build_search_params(keyword)
+            
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Yahoo検索URL: %s?va=%s", self.SEARCH_URL, quote(keyword))
+            
+            html = await self._fetch_async(session, params)
+            
+            # HTML解析
+            items = self.parse(html)
+            logger.info("Yahoo検索結果: %d件（キーワード: %s）", len(items), keyword)
+            
+            return items
+            
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Yahoo検索リクエストエラー: {e}")
+            return []
+        except Exception as e:
+            logger.error(f"Yahoo検索処理エラー: {e}", exc_info=True)
+            return []
+    
+    def _fetch(self, params: Dict[str, Any]) -> str:
+        """
+        検索ページを取得する（一時的なエラーは指数バックオフでリトライ）
+        
+        Args:
+            params: クエリパラメータ
+            
+        Returns:
+            HTML文字列
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            # リクエスト間隔を空ける（リトライ時も含めて毎回）
+            rate_limit.acquire_blocking(self.HOST)
+            try:
+                response = self.session.get(self.SEARCH_URL, params=params, timeout=10)
+                if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                    response.raise_for_status()
+                    return response.text
+                reason = f"HTTP {response.status_code}"
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt == MAX_RETRIES:
+                    raise
+                reason = str(e) or type(e).__name__
+            
+            delay = BACKOFF_FACTOR * (2 ** attempt)
+            logger.warning("Yahoo検索リトライ（%d/%d回目、%.1f秒後）: %s", attempt + 1, MAX_RETRIES, delay, reason)
+            time.sleep(delay)
+    
+    async def _fetch_async(self, session: aiohttp.ClientSession, params: Dict[str, Any]) -> str:
+        """
+        検索ページを取得する（一時的なエラーは指数バックオフでリトライ）
+        
+        Args:
+            session: aiohttpセッション
+            params: クエリパラメータ
+            
+        Returns:
+            HTML文字列
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            # リクエスト間隔を空ける（待機中も他サイトの処理は進む）
+            await rate_limit.acquire(self.HOST)
+            try:
+                async with session.get(
+                    self.SEARCH_URL,
+                    params=params,
+                    headers=self.HEADERS,
+                    timeout=aiohttp.ClientTimeout(total=10)
+                ) as response:
+                    if response.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                        response.raise_for_status()
+                        return await response.text()
+                    reason = f"HTTP {response.status}"
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt == MAX_RETRIES:
+                    raise
+                reason = str(e) or type(e).__name__
+            
+            delay = BACKOFF_FACTOR * (2 ** attempt)
+            logger.warning("Yahoo検索リトライ（%d/%d回目、%.1f秒後）: %s", attempt + 1, MAX_RETRIES, delay, reason)
+            await asyncio.sleep(delay)
+    
+    def _build_search_params(self, keyword: str) -> Dict[str, Any]:
+        """
+        検索URLのクエリパラメータを生成
+        
+        Args:
+            keyword: 検索キーワード
+            
+        Returns:
+            クエリパラメータ辞書
+        """
+        return {
+            'va': keyword,  # 検索キーワード
+            'exflg': 1,     # 詳細検索フラグ
+            'b': 1,         # 開始位置
+            'n': 50         # 取得件数
+        }
+    
     def parse(self, html: str) -> List[Dict[str, Any]]:
         """
         Yahoo!オークションのHTMLを解析して商品情報を抽出
@@ -78,19 +247,23 @@ class YahooScraper(BaseScraper):
         Returns:
             商品情報のリスト
         """
+        # lxmlは空の文書を解析できない（ParserError）ため、空レスポンスは商品なしとして扱う
+        if not html.strip():
+            return []
+        
         items = []
         
         try:
-            soup = BeautifulSoup(html, 'lxml')
+            tree = lxml.html.fromstring(html)
             
             # 商品リストの取得（YahooオークションのHTML構造に基づく）
             # 注意: YahooオークションのHTML構造は変更される可能性があるため、
             # 実際のサイト構造に合わせて調整が必要
-            product_list = soup.find_all('li', class_='Product')
+            product_list = _LI_PRODUCT_XPATH(tree)
             
             if not product_list:
                 # 別のセレクタを試す
-                product_list = soup.find_all('div', class_='Product')
+                product_list = _DIV_PRODUCT_XPATH(tree)
             
             for product in product_list:
                 try:
@@ -98,36 +271,38 @@ class YahooScraper(BaseScraper):
                     if item:
                         items.append(item)
                 except Exception as e:
-                    logger.debug(f"商品情報抽出エラー: {e}")
+                    logger.debug("商品情報抽出エラー: %s", e)
                     continue
             
             # 商品が見つからない場合、より汎用的な方法を試す
             if not items:
-                items = self._parse_alternative(html)
+                # 解析済みのツリーを渡し、HTMLを再解析しない
+                items = self._parse_alternative(tree)
             
         except Exception as e:
             logger.error(f"HTML解析エラー: {e}", exc_info=True)
         
         return items
     
-    def _extract_item_info(self, product_element) -> Dict[str, Any]:
+    def _extract_item_info(self, product_element: lxml.html.HtmlElement) -> Optional[Dict[str, Any]]:
         """
         商品要素から情報を抽出
         
         Args:
-            product_element: BeautifulSoup要素
+            product_element: lxmlの要素（HtmlElement）
             
         Returns:
-            商品情報辞書
+            商品情報辞書（タイトルまたはURLが取れない場合はNone）
         """
-        item = {}
+        item: Dict[str, Any] = {}
         
         # タイトル取得
-        title_elem = product_element.find('a', class_='Product__titleLink')
-        if not title_elem:
-            title_elem = product_element.find('h3')
-        if title_elem:
-            item['title'] = title_elem.get_text(strip=True)
+        title_elems = _TITLE_LINK_XPATH(product_element)
+        if not title_elems:
+            title_elems = _H3_XPATH(product_element)
+        if title_elems:
+            title_elem = title_elems[0]
+            item['title'] = _get_text(title_elem)
             # URL取得
             href = title_elem.get('href', '')
             if href:
@@ -137,11 +312,18 @@ class YahooScraper(BaseScraper):
                     item['url'] = href
         
         # 価格取得
-        price_elem = product_element.find('span', class_='Product__priceValue')
-        if not price_elem:
-            price_elem = product_element.find('span', string=re.compile(r'¥|円'))
-        if price_elem:
-            price_text = price_elem.get_text(strip=True)
+        price_elem = None
+        price_elems = _PRICE_VALUE_XPATH(product_element)
+        if price_elems:
+            price_elem = price_elems[0]
+        else:
+            # 子要素を持たず、テキストに通貨記号を含むspan
+            for span in _LEAF_SPAN_XPATH(product_element):
+                if _PRICE_TEXT_RE.search(span.text or ''):
+                    price_elem = span
+                    break
+        if price_elem is not None:
+            price_text = _get_text(price_elem)
             price = self._parse_price(price_text)
             item['price'] = price
         
@@ -153,12 +335,12 @@ class YahooScraper(BaseScraper):
         
         return item if item.get('title') and item.get('url') else None
     
-    def _parse_alternative(self, html: str) -> List[Dict[str, Any]]:
+    def _parse_alternative(self, tree: lxml.html.HtmlElement) -> List[Dict[str, Any]]:
         """
         代替パース方法（HTML構造が異なる場合のフォールバック）
         
         Args:
-            html: HTML文字列
+            tree: parse()で解析済みのHTMLツリー
             
         Returns:
             商品情報のリスト
@@ -166,14 +348,12 @@ class YahooScraper(BaseScraper):
         items = []
         
         try:
-            soup = BeautifulSoup(html, 'lxml')
-            
             # リンクから商品を探す
-            links = soup.find_all('a', href=re.compile(r'/jp/auction/'))
+            links = [link for link in tree.iter('a') if _ALT_HREF_RE.search(link.get('href', ''))]
             
             for link in links[:50]:  # 最大50件
                 try:
-                    title = link.get_text(strip=True)
+                    title = _get_text(link)
                     if not title:
                         continue
                     
@@ -185,12 +365,13 @@ class YahooScraper(BaseScraper):
                     item_id = self._extract_item_id_from_url(url)
                     
                     # 価格を探す（親要素周辺から）
-                    parent = link.find_parent()
+                    parent = link.getparent()
                     price = 0
-                    if parent:
-                        price_elem = parent.find(string=re.compile(r'¥\d+'))
-                        if price_elem:
-                            price = self._parse_price(price_elem)
+                    if parent is not None:
+                        for text in parent.itertext():
+                            if _ALT_PRICE_RE.search(text):
+                                price = self._parse_price(text)
+                                break
                     
                     items.append({
                         'title': title,
@@ -199,7 +380,7 @@ class YahooScraper(BaseScraper):
                         'item_id': item_id
                     })
                 except Exception as e:
-                    logger.debug(f"代替パースエラー: {e}")
+                    logger.debug("代替パースエラー: %s", e)
                     continue
                     
         except Exception as e:
@@ -219,7 +400,7 @@ class YahooScraper(BaseScraper):
         """
         try:
             # 数字以外を除去
-            numbers = re.sub(r'[^\d]', '', price_text)
+            numbers = _PRICE_NON_DIGITS.sub('', price_text)
             return int(numbers) if numbers else 0
         except:
             return 0
@@ -236,7 +417,7 @@ class YahooScraper(BaseScraper):
         """
         try:
             # YahooオークションのURL形式: /jp/auction/{item_id}
-            match = re.search(r'/auction/([a-z0-9]+)', url)
+            match = _ITEM_ID_RE.search(url)
             if match:
                 return match.group(1)
         except:
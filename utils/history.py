@@ -0,0 +1,126 @@
+"""
+通知済み商品IDの履歴管理モジュール（SQLite使用）
+"""
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, List, Set
+
+# IN句に渡すプレースホルダ数の上限（SQLiteの変数上限より十分小さく）
+_QUERY_CHUNK_SIZE = 500
+
+
+class SeenHistory:
+    """(サイト, キーワード, 商品ID) 単位で通知済み商品を記録する履歴DB"""
+
+    def __init__(self, db_path: Path):
+        """
+        初期化
+
+        Args:
+            db_path: SQLiteデータベースファイルのパス
+        """
+        # 非同期実行時はワーカースレッドから呼ばれるため、スレッドチェックを無効化
+        # （1つのスクレイパーからの呼び出しは順番に行われる）
+        self._conn = sqlite3.connect(str(db_path), isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen("
+            "site TEXT, kw TEXT, id TEXT, PRIMARY KEY(site, kw, id)"
+            ") WITHOUT ROWID"
+        )
+
+    def close(self) -> None:
+        """
+        データベース接続を閉じる
+        """
+        self._conn.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        ブロック内の書き込みを1トランザクションにまとめる
+        途中で例外が発生した場合はロールバックし、書きかけの状態を残さない
+        （既にトランザクション中の場合は外側のトランザクションに含める）
+        """
+        if self._conn.in_transaction:
+            yield
+            return
+
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def has_site(self, site: str) -> bool:
+        """
+        指定サイトの履歴が1件でも存在するか
+
+        Args:
+            site: サイト名
+
+        Returns:
+            存在する場合True
+        """
+        row = self._conn.execute("SELECT 1 FROM seen WHERE site = ? LIMIT 1", (site,)).fetchone()
+        return row is not None
+
+    def has_keyword(self, site: str, kw: str) -> bool:
+        """
+        指定キーワードの履歴が1件でも存在するか（初回判定用）
+
+        Args:
+            site: サイト名
+            kw: 検索キーワード
+
+        Returns:
+            存在する場合True
+        """
+        row = self._conn.execute(
+            "SELECT 1 FROM seen WHERE site = ? AND kw = ? LIMIT 1", (site, kw)
+        ).fetchone()
+        return row is not None
+
+    def seen_ids(self, site: str, kw: str, ids: Iterable[str]) -> Set[str]:
+        """
+        指定した商品IDのうち、通知済みのものを返す
+
+        Args:
+            site: サイト名
+            kw: 検索キーワード
+            ids: 判定対象の商品ID
+
+        Returns:
+            通知済みの商品IDセット
+        """
+        id_list: List[str] = list(ids)
+        seen: Set[str] = set()
+        for start in range(0, len(id_list), _QUERY_CHUNK_SIZE):
+            chunk = id_list[start:start + _QUERY_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT id FROM seen WHERE site = ? AND kw = ? AND id IN ({placeholders})",
+                (site, kw, *chunk)
+            )
+            seen.update(row[0] for row in rows)
+        return seen
+
+    def mark_seen_many(self, site: str, kw: str, ids: Iterable[str]) -> None:
+        """
+        商品IDをまとめて通知済みとして記録する（既存のIDは無視）
+
+        Args:
+            site: サイト名
+            kw: 検索キーワード
+            ids: 記録する商品ID
+        """
+        # 自動コミットのままだと1行ごとにコミットされるため、まとめて1回でコミットする
+        with self.transaction():
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO seen(site, kw, id) VALUES (?, ?, ?)",
+                ((site, kw, item_id) for item_id in ids)
+            )
@@ -1,7 +1,10 @@
 """
 ログ機能モジュール
 """
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 from datetime import datetime
 from pathlib import Path
@@ -14,24 +17,16 @@ LOG_DIR.mkdir(exist_ok=True)
 LOG_FILE = LOG_DIR / f"resale_radar_{datetime.now().strftime('%Y%m%d')}.log"
 
 
-def get_logger(name: str) -> logging.Logger:
+def _create_listener(log_queue: queue.Queue) -> logging.handlers.QueueListener:
     """
-    ロガーを取得
+    キューに溜まったログをコンソール・ファイルへ書き出すリスナーを作成
     
     Args:
-        name: ロガー名（通常は__name__）
+        log_queue: ログレコードのキュー
         
     Returns:
-        設定済みロガー
+        QueueListener（未開始）
     """
-    logger = logging.getLogger(name)
-    
-    # 既にハンドラが設定されている場合はそのまま返す
-    if logger.handlers:
-        return logger
-    
-    logger.setLevel(logging.DEBUG)
-    
     # フォーマッター
     formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -48,8 +43,38 @@ def get_logger(name: str) -> logging.Logger:
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(formatter)
     
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    return logging.handlers.QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+
+
+# ログ出力（ディスク・コンソールへの書き込み）は専用スレッドで行い、
+# 呼び出し元はキューに積むだけにする
+_log_queue: queue.Queue = queue.Queue(-1)
+_queue_handler = logging.handlers.QueueHandler(_log_queue)
+_listener = _create_listener(_log_queue)
+_listener.start()
+# 終了時にキューに残ったログを書き出してからスレッドを止める
+atexit.register(_listener.stop)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    ロガーを取得
+    
+    Args:
+        name: ロガー名（通常は__name__）
+        
+    Returns:
+        設定済みロガー
+    """
+    logger = logging.getLogger(name)
+    
+    # 既にハンドラが設定されている場合はそのまま返す
+    if logger.handlers:
+        return logger
+    
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(_queue_handler)
     
     return logger
-
@@ -2,8 +2,9 @@
 LINE通知機能モジュール（LINE Messaging API使用）
 """
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 from dotenv import load_dotenv
 from linebot import LineBotApi
 from linebot.models import TextSendMessage
@@ -18,6 +19,25 @@ load_dotenv(dotenv_path=ENV_PATH)
 logger = get_logger(__name__)
 
 
+# LINE Messaging APIで1リクエストに含められるメッセージ数の上限
+MAX_MESSAGES_PER_PUSH = 5
+
+# 環境変数はモジュール読み込み時に一度だけ取得する
+_TOKEN = os.getenv('LINE_CHANNEL_ACCESS_TOKEN')
+_USER_ID = os.getenv('LINE_USER_ID')
+
+
+@lru_cache(maxsize=1)
+def _get_client() -> LineBotApi:
+    """
+    環境変数のトークンで生成したLineBotApiを取得（プロセス内で一度だけ生成）
+    
+    Returns:
+        LineBotApiインスタンス
+    """
+    return LineBotApi(_TOKEN)
+
+
 def send_line_notification(message: str, channel_access_token: Optional[str] = None, user_id: Optional[str] = None) -> bool:
     """
     LINE Messaging APIで通知を送信
@@ -30,12 +50,32 @@ def send_line_notification(message: str, channel_access_token: Optional[str] = N
     Returns:
         送信成功時True、失敗時False
     """
+    return send_line_notifications([message], channel_access_token, user_id)
+
+
+def send_line_notifications(messages: List[str], channel_access_token: Optional[str] = None, user_id: Optional[str] = None) -> bool:
+    """
+    LINE Messaging APIで複数の通知をまとめて送信
+    1リクエストにつき最大5件のメッセージを送る
+    
+    Args:
+        messages: 送信するメッセージのリスト
+        channel_access_token: チャネルアクセストークン（未指定の場合は環境変数から取得）
+        user_id: ユーザーID（未指定の場合は環境変数から取得）
+        
+    Returns:
+        全件送信成功時True、失敗時False
+    """
+    if not messages:
+        return True
+    
     # トークンとユーザーID取得
+    use_cached_client = channel_access_token is None
     if channel_access_token is None:
-        channel_access_token = os.getenv('LINE_CHANNEL_ACCESS_TOKEN')
+        channel_access_token = _TOKEN
     
     if user_id is None:
-        user_id = os.getenv('LINE_USER_ID')
+        user_id = _USER_ID
     
     if not channel_access_token:
         logger.warning("LINE_CHANNEL_ACCESS_TOKENが設定されていません。通知をスキップします。")
@@ -46,13 +86,15 @@ def send_line_notification(message: str, channel_access_token: Optional[str] = N
         return False
     
     try:
-        # LineBotApi初期化
-        line_bot_api = LineBotApi(channel_access_token)
+        # 引数でトークンが指定された場合はキャッシュを使わない
+        line_bot_api = _get_client() if use_cached_client else LineBotApi(channel_access_token)
         
-        # プッシュ通知送信
-        line_bot_api.push_message(user_id, TextSendMessage(text=message))
+        # プッシュ通知送信（5件ずつ）
+        for start in range(0, len(messages), MAX_MESSAGES_PER_PUSH):
+            chunk = messages[start:start + MAX_MESSAGES_PER_PUSH]
+            line_bot_api.push_message(user_id, [TextSendMessage(text=m) for m in chunk])
         
-        logger.debug("LINE通知送信成功")
+        logger.debug("LINE通知送信成功（%d件）", len(messages))
         return True
         
     except LineBotApiError as e:
@@ -63,4 +105,3 @@ def send_line_notification(message: str, channel_access_token: Optional[str] = N
     except Exception as e:
         logger.error(f"LINE通知処理エラー: {e}", exc_info=True)
         return False
-
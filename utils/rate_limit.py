@@ -0,0 +1,92 @@
+"""
+リクエスト頻度制限モジュール（ホスト単位のトークンバケット）
+"""
+import asyncio
+import threading
+import time
+from typing import Dict
+
+# 1ホストあたりの既定のリクエスト頻度（回/秒）
+DEFAULT_RATE = 2.0
+
+
+class TokenBucket:
+    """
+    トークンバケット
+    トークンを先に予約して待ち時間を返すため、スレッドからもイベントループからも使える
+    """
+
+    def __init__(self, rate: float = DEFAULT_RATE, capacity: float = 1.0):
+        """
+        初期化
+
+        Args:
+            rate: 1秒あたりに補充するトークン数（＝許可するリクエスト数）
+            capacity: バケットの容量（連続して送れるリクエスト数）
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        トークンを1つ予約する
+
+        Returns:
+            リクエストを送るまでに待つ秒数（すぐに送れる場合は0）
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            # 不足分はマイナスのまま予約し、後続の呼び出しほど待ち時間が長くなる
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(host: str) -> TokenBucket:
+    """
+    ホストごとのトークンバケットを取得（なければ作成）
+
+    Args:
+        host: ホスト名
+
+    Returns:
+        トークンバケット
+    """
+    with _buckets_lock:
+        if host not in _buckets:
+            _buckets[host] = TokenBucket()
+        return _buckets[host]
+
+
+async def acquire(host: str) -> None:
+    """
+    ホストへのリクエスト枠が空くまで待つ（非同期版、待機中も他の処理は進む）
+
+    Args:
+        host: ホスト名
+    """
+    wait = get_bucket(host).reserve()
+    if wait > 0:
+        await asyncio.sleep(wait)
+
+
+def acquire_blocking(host: str) -> None:
+    """
+    ホストへのリクエスト枠が空くまで待つ（同期版）
+
+    Args:
+        host: ホスト名
+    """
+    wait = get_bucket(host).reserve()
+    if wait > 0:
+        time.sleep(wait)